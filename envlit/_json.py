@@ -0,0 +1,71 @@
+"""
+JSON encoding for envlit's snapshot and state payloads.
+Uses orjson when it is installed and falls back to the standard library otherwise.
+"""
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# orjson.JSONDecodeError subclasses this, so callers can catch a single type
+JSONDecodeError = json.JSONDecodeError
+
+# json.dumps builds a new encoder whenever options are passed, so build ours once.
+# Compact separators match orjson's output. ensure_ascii stays on so lone surrogates
+# are written as \udcXX escapes rather than characters stdout cannot encode.
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+_SORTED_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize obj to a JSON string.
+
+    Args:
+        obj: Object to serialize
+        sort_keys: Emit object keys in sorted order, for output that is stable across runs
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None).decode()
+        except TypeError:
+            # orjson rejects lone surrogates (undecodable bytes in os.environ);
+            # the stdlib encoder escapes them instead
+            pass
+    return (_SORTED_ENCODER if sort_keys else _ENCODER).encode(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Raises:
+        JSONDecodeError: If data is not valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Escaped lone surrogates are valid for the stdlib decoder only
+            pass
+    if isinstance(data, bytes):
+        # Let undecodable bytes surface as JSONDecodeError rather than UnicodeDecodeError
+        data = data.decode("utf-8", "surrogateescape")
+    return json.loads(data)
+
+
+def getenv(name: str) -> str | bytes | None:
+    """
+    Read a JSON payload from the environment without decoding it.
+
+    Returns the raw bytes where the platform exposes them (os.environb), so
+    loads() can parse them directly; otherwise the str value. None if unset.
+    """
+    if os.supports_bytes_environ:
+        return os.environb.get(os.fsencode(name))
+    return os.environ.get(name)
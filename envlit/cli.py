@@ -4,15 +4,61 @@ Provides shell script generation commands.
 """
 
 import os
-import shutil
 import sys
 from pathlib import Path
 
 import click
 
 from envlit.__about__ import __version__
-from envlit.config import load_config
-from envlit.script_generator import generate_load_script, generate_unload_script
+
+# Shell integration emitted by `envlit init`, filled in with %-formatting
+_INIT_TEMPLATE = """# envlit shell integration
+# Generated for %(shell)s
+
+%(alias_load)s() {
+    # Check if help flag is present
+    for arg in "$@"; do
+        if [[ "$arg" == "-h" || "$arg" == "--help" ]]; then
+            envlit load "$@"
+            return $?
+        fi
+    done
+
+    # Normal load behavior
+    local tmp_script
+    tmp_script=$(mktemp "${TMPDIR:-/tmp}/envlit.XXXXXX")
+
+    if envlit load "$@" > "$tmp_script"; then
+        source "$tmp_script"
+    else
+        echo "Error: Failed to generate envlit environment."
+    fi
+
+    rm -f "$tmp_script"
+}
+
+%(alias_unload)s() {
+    # Check if help flag is present
+    for arg in "$@"; do
+        if [[ "$arg" == "-h" || "$arg" == "--help" ]]; then
+            envlit unload "$@"
+            return $?
+        fi
+    done
+
+    # Normal unload behavior
+    local tmp_script
+    tmp_script=$(mktemp "${TMPDIR:-/tmp}/envlit.XXXXXX")
+
+    if envlit unload "$@" > "$tmp_script"; then
+        source "$tmp_script"
+    else
+        echo "Error: Failed to generate envlit unload script."
+    fi
+
+    rm -f "$tmp_script"
+}
+"""
 
 
 def find_config_file(profile: str | None = None, search_dir: Path | None = None) -> Path | None:
@@ -38,21 +84,45 @@ def find_config_file(profile: str | None = None, search_dir: Path | None = None)
         search_dir = Path.cwd()
 
     envlit_dir = search_dir / ".envlit"
-    if not envlit_dir.is_dir():
-        return None
 
     # Determine profile name
     profile_name = profile or "default"
+    candidates = (f"{profile_name}.yaml", f"{profile_name}.yml")
+
+    # A single directory scan replaces separate stat calls per candidate
+    found: dict[str, Path] = {}
+    try:
+        with os.scandir(envlit_dir) as entries:
+            for entry in entries:
+                if entry.name in candidates and entry.is_file():
+                    found[entry.name] = Path(entry.path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
 
-    # Try .yaml first, then .yml
-    for ext in [".yaml", ".yml"]:
-        config_path = envlit_dir / f"{profile_name}{ext}"
-        if config_path.is_file():
-            return config_path
+    # Prefer .yaml over .yml
+    for name in candidates:
+        if name in found:
+            return found[name]
+
+    # The scan matches names exactly; on case-insensitive filesystems (macOS and
+    # Windows defaults) a direct probe still finds dev.yaml for profile "Dev"
+    for name in candidates:
+        path = envlit_dir / name
+        if path.is_file():
+            return path
 
     return None
 
 
+# Escapes applied inside double-quoted values by `envlit state`
+_DOTENV_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
+def _detect_shell() -> str:
+    """Guess the user's shell from $SHELL, defaulting to bash."""
+    return "zsh" if "zsh" in os.environ.get("SHELL", "") else "bash"
+
+
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
 @click.version_option(version=__version__, prog_name="envlit")
 def cli():
@@ -84,7 +154,15 @@ class DynamicFlagCommand(click.Command):
             if arg in value_options and i + 1 < len(args):
                 config_path_str = args[i + 1]
                 i += 2
-            elif arg in no_value_flags:
+            elif arg.startswith("--config="):
+                config_path_str = arg.partition("=")[2]
+                i += 1
+            elif arg.startswith("-c") and not arg.startswith("--") and len(arg) > 2:
+                # Attached short form: -cPATH
+                config_path_str = arg[2:]
+                i += 1
+            elif arg in no_value_flags or (arg.startswith("--") and "=" in arg):
+                # Boolean flags and --flag=value carry no separate value
                 i += 1
             elif arg.startswith("-"):
                 # Flag may have a value - check next arg
@@ -102,8 +180,9 @@ class DynamicFlagCommand(click.Command):
 
     def _register_legacy_flags(self, config_dict: dict) -> None:
         """Add Click options from the deprecated top-level flags: section."""
+        existing = {p.name for p in self.params}
         for flag_name, flag_config in config_dict.get("flags", {}).items():
-            if any(p.name == flag_name for p in self.params):
+            if flag_name in existing:
                 continue
             flag_aliases = flag_config.get("flag", [f"--{flag_name}"])
             if isinstance(flag_aliases, str):
@@ -117,14 +196,16 @@ class DynamicFlagCommand(click.Command):
                     help=f"Set {target} (default: {default_value})",
                 )
             )
+            existing.add(flag_name)
 
     def _register_inline_flags(self, config_dict: dict) -> None:
         """Add Click options from inline flag: entries inside env: section."""
+        existing = {p.name for p in self.params}
         for var_name, var_value in config_dict.get("env", {}).items():
             if not isinstance(var_value, dict) or "flag" not in var_value:
                 continue
             param_name = var_name.lower()
-            if any(p.name == param_name for p in self.params):
+            if param_name in existing:
                 continue
             flag_aliases = var_value.get("flag", [])
             if isinstance(flag_aliases, str):
@@ -139,18 +220,31 @@ class DynamicFlagCommand(click.Command):
                     help=f"Set {var_name} (default: {default_value})",
                 )
             )
+            existing.add(param_name)
 
     def parse_args(self, ctx: click.Context, args: list):
         """Override parse_args to add dynamic options before argument parsing."""
+        from envlit.config import load_config
+
         profile, config_path_str = self._parse_for_profile_and_config(args)
 
-        config_path = Path(config_path_str) if config_path_str else find_config_file(profile)
+        # Resolve the working directory once and share it with the command body
+        ctx.ensure_object(dict)
+        cwd = ctx.obj["_cwd"] = Path.cwd()
+
+        if config_path_str:
+            config_path: Path | None = Path(config_path_str)
+        else:
+            config_path = find_config_file(profile, search_dir=cwd)
+            # Remember the lookup (including a miss) so load() doesn't repeat it
+            ctx.obj["_found_config"] = (profile, config_path)
 
         if config_path and config_path.is_file():
             try:
+                # A full load is needed (inline flags live under env:, and extends may
+                # add more); load() reuses this result instead of parsing again.
                 config_dict = load_config(str(config_path))
 
-                ctx.ensure_object(dict)
                 ctx.obj["_preloaded_config"] = config_dict
                 ctx.obj["_preloaded_config_path"] = str(config_path)
 
@@ -166,7 +260,7 @@ class DynamicFlagCommand(click.Command):
 @cli.command(cls=DynamicFlagCommand)
 @click.pass_context
 @click.argument("profile", required=False)
-@click.option("--config", "-c", type=click.Path(exists=True), help="Path to config file")
+@click.option("--config", "-c", type=click.Path(), help="Path to config file")
 def load(ctx: click.Context, profile: str | None, config: str | None, **kwargs):  # noqa: C901
     """Generate shell script to load environment configuration.
 
@@ -183,13 +277,20 @@ def load(ctx: click.Context, profile: str | None, config: str | None, **kwargs):
 
     Dynamic flags from the config file are automatically added as options.
     """
+    from envlit.config import load_config
+    from envlit.script_generator import generate_load_script
+
+    preloaded = ctx.obj or {}
+    cwd = preloaded.get("_cwd") or Path.cwd()
+
     try:
         # Find config file
         config_path: Path
         if config:
             config_path = Path(config)
         else:
-            found_path = find_config_file(profile)
+            found = preloaded.get("_found_config")
+            found_path = found[1] if found and found[0] == profile else find_config_file(profile, search_dir=cwd)
             if not found_path:
                 profile_msg = f" for profile '{profile}'" if profile else ""
                 click.echo(f"Error: No config file found{profile_msg}", err=True)
@@ -198,7 +299,6 @@ def load(ctx: click.Context, profile: str | None, config: str | None, **kwargs):
             config_path = found_path
 
         # Use pre-loaded config from parse_args if available for the same path
-        preloaded = ctx.obj or {}
         if preloaded.get("_preloaded_config_path") == str(config_path):
             config_dict = preloaded["_preloaded_config"]
         else:
@@ -250,7 +350,7 @@ def load(ctx: click.Context, profile: str | None, config: str | None, **kwargs):
 
 @cli.command()
 @click.option("--profile", "-p", help="Profile name (e.g., dev, prod)")
-@click.option("--config", "-c", type=click.Path(exists=True), help="Path to config file")
+@click.option("--config", "-c", type=click.Path(), help="Path to config file")
 def unload(profile: str | None, config: str | None):
     """Generate shell script to unload environment configuration.
 
@@ -262,6 +362,9 @@ def unload(profile: str | None, config: str | None):
     Direct usage:
       source <(envlit unload)
     """
+    from envlit.config import load_config
+    from envlit.script_generator import generate_unload_script
+
     try:
         # Find config file (needed for hooks)
         config_path: Path | None
@@ -310,75 +413,10 @@ def init(shell: str, alias_load: str, alias_unload: str):
 
     # Auto-detect shell if needed
     if shell == "auto":
-        shell_env = os.environ.get("SHELL", "")
-        if "zsh" in shell_env:
-            shell = "zsh"
-        elif "bash" in shell_env:
-            shell = "bash"
-        else:
-            # Default to bash if can't detect
-            shell = "bash"
+        shell = _detect_shell()
 
     # Generate shell initialization code
-    lines = [
-        "# envlit shell integration",
-        f"# Generated for {shell}",
-        "",
-    ]
-
-    # Function for load
-    lines.extend([
-        f"{alias_load}() {{",
-        "    # Check if help flag is present",
-        '    for arg in "$@"; do',
-        '        if [[ "$arg" == "-h" || "$arg" == "--help" ]]; then',
-        '            envlit load "$@"',
-        "            return $?",
-        "        fi",
-        "    done",
-        "",
-        "    # Normal load behavior",
-        "    local tmp_script",
-        '    tmp_script=$(mktemp "${TMPDIR:-/tmp}/envlit.XXXXXX")',
-        "",
-        '    if envlit load "$@" > "$tmp_script"; then',
-        '        source "$tmp_script"',
-        "    else",
-        '        echo "Error: Failed to generate envlit environment."',
-        "    fi",
-        "",
-        '    rm -f "$tmp_script"',
-        "}",
-        "",
-    ])
-
-    # Function for unload
-    lines.extend([
-        f"{alias_unload}() {{",
-        "    # Check if help flag is present",
-        '    for arg in "$@"; do',
-        '        if [[ "$arg" == "-h" || "$arg" == "--help" ]]; then',
-        '            envlit unload "$@"',
-        "            return $?",
-        "        fi",
-        "    done",
-        "",
-        "    # Normal unload behavior",
-        "    local tmp_script",
-        '    tmp_script=$(mktemp "${TMPDIR:-/tmp}/envlit.XXXXXX")',
-        "",
-        '    if envlit unload "$@" > "$tmp_script"; then',
-        '        source "$tmp_script"',
-        "    else",
-        '        echo "Error: Failed to generate envlit unload script."',
-        "    fi",
-        "",
-        '    rm -f "$tmp_script"',
-        "}",
-        "",
-    ])
-
-    click.echo("\n".join(lines))
+    click.echo(_INIT_TEMPLATE % {"shell": shell, "alias_load": alias_load, "alias_unload": alias_unload})
 
 
 @cli.command()
@@ -411,7 +449,7 @@ def state(from_env: bool):
             # Simple shell quoting - add quotes if value contains spaces or special chars
             if any(c in value for c in [" ", "\t", "$", "`", '"', "'", "\\"]):
                 # Escape backslashes and double quotes
-                escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+                escaped = value.translate(_DOTENV_ESCAPES)
                 click.echo(f'{key}="{escaped}"')
             else:
                 click.echo(f"{key}={value}")
@@ -434,6 +472,7 @@ def doctor(shell: str):
 
     Verifies that envlit is properly set up in your shell.
     """
+    import shutil
 
     click.echo("🔍 envlit Doctor - Checking Installation\n")
 
@@ -457,12 +496,15 @@ def doctor(shell: str):
     if envlit_dir.is_dir():
         click.echo(f"✓ Config directory found: {envlit_dir}")
 
-        # List config files
-        configs = list(envlit_dir.glob("*.yaml")) + list(envlit_dir.glob("*.yml"))
+        # List config files (one directory scan for both extensions)
+        with os.scandir(envlit_dir) as entries:
+            configs = sorted(
+                entry.name for entry in entries if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+            )
         if configs:
             click.echo(f"  Found {len(configs)} config file(s):")
             for config in configs:
-                click.echo(f"    - {config.name}")
+                click.echo(f"    - {config}")
         else:
             click.echo("  ⚠ No config files found (.yaml or .yml)")
     else:
@@ -3,17 +3,77 @@ Configuration parsing and management.
 Handles YAML config loading with inheritance support.
 """
 
+import copy
+import json
+import os
+import tempfile
 import warnings
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import yaml
 
+from envlit.__about__ import __version__
+
+# libyaml-backed loader when available; falls back to the pure-Python one otherwise
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Sections merged key-by-key instead of being replaced wholesale
+_MERGED_SECTIONS = frozenset({"env", "flags", "hooks"})
+
+# Parsed YAML documents keyed by (resolved path, mtime_ns, size)
+_CONFIG_CACHE: dict[tuple[str, int, int], Any] = {}
+
+
+class _SourceStamp(NamedTuple):
+    """A config file as it was read: the path given, the file it resolves to, its mtime and size."""
+
+    path: str
+    resolved: str
+    mtime_ns: int
+    size: int
+
+
+def _source_stamp(path: Path) -> _SourceStamp:
+    resolved = str(path.resolve())
+    st = path.stat()
+    return _SourceStamp(os.path.abspath(path), resolved, st.st_mtime_ns, st.st_size)
+
+
+def _read_yaml(config_file: Path) -> tuple[Any, _SourceStamp]:
+    """
+    Parse a YAML file, reusing the result of an earlier parse of the same file.
+
+    The returned object is shared with the cache and must not be mutated.
+
+    Returns:
+        The parsed document and the source stamp it was read under.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        yaml.YAMLError: If the YAML is invalid.
+    """
+    try:
+        stamp = _source_stamp(config_file)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_file}") from None
+
+    key = (stamp.resolved, stamp.mtime_ns, stamp.size)
+    if key not in _CONFIG_CACHE:
+        with open(config_file, "rb") as f:
+            _CONFIG_CACHE[key] = yaml.load(f, Loader=_YamlLoader)  # noqa: S506
+    return _CONFIG_CACHE[key], stamp
+
 
 def load_config(config_path: str) -> dict[str, Any]:
     """
     Load a YAML configuration file.
 
+    Configs that live in a ``.envlit`` directory are additionally cached, fully
+    resolved, in ``.envlit/.cache/``; the cache entry is reused as long as none
+    of the files in its ``extends`` chain have changed. Either way the returned
+    dictionary belongs to the caller; mutating it does not affect later loads.
+
     Args:
         config_path: Path to the YAML configuration file.
 
@@ -25,23 +85,13 @@ def load_config(config_path: str) -> dict[str, Any]:
         yaml.YAMLError: If the YAML is invalid.
     """
     config_file = Path(config_path)
-    if not config_file.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
-
-    with open(config_file) as f:
-        config = yaml.safe_load(f)
+    cache_file = _cache_file_for(config_file)
 
-    # Handle empty file
+    config = _read_cache(cache_file) if cache_file else None
     if config is None:
-        config = {}
-
-    # Normalize config structure
-    if "env" not in config:
-        config["env"] = {}
-    if "flags" not in config:
-        config["flags"] = {}
-    if "hooks" not in config:
-        config["hooks"] = {}
+        config, sources = _resolve_config(config_file)
+        if cache_file:
+            _write_cache(cache_file, config, sources)
 
     if config.get("flags"):
         warnings.warn(
@@ -51,19 +101,130 @@ def load_config(config_path: str) -> dict[str, Any]:
             stacklevel=2,
         )
 
-    # Handle inheritance
-    if "extends" in config:
-        parent_path = config.pop("extends")
-        # Resolve relative paths
-        if not Path(parent_path).is_absolute():
-            parent_path = config_file.parent / parent_path
-        parent_config = load_config(str(parent_path))
-        config = _merge_configs(parent_config, config)
+    return config
+
 
+def _resolve_config(config_file: Path) -> tuple[dict[str, Any], list[_SourceStamp]]:
+    """
+    Parse, normalize and resolve inheritance for a config file.
+
+    The ``extends`` chain is walked iteratively, so each file is parsed once
+    and cycles are reported instead of recursing forever.
+
+    Returns:
+        The resolved configuration and the source stamp of every file it was
+        built from.
+
+    Raises:
+        ValueError: If the ``extends`` chain is circular.
+    """
+    # Collect the extends chain, leaf first
+    chain: list[tuple[Path, dict[str, Any]]] = []
+    sources: list[_SourceStamp] = []
+    visited: set[Path] = set()
+    current: Path | None = config_file
+    while current is not None:
+        resolved = current.resolve()
+        if resolved in visited:
+            raise ValueError(f"Circular 'extends' chain detected at: {current}")
+        visited.add(resolved)
+
+        raw, stamp = _read_yaml(current)
+        sources.append(stamp)
+        # Handle empty file
+        if raw is None:
+            raw = {}
+        if not isinstance(raw, dict):
+            raise TypeError(f"Config file '{current}' must contain a YAML dictionary")
+        chain.append((current, raw))
+
+        if "extends" in raw:
+            parent_path = Path(raw["extends"])
+            # Resolve relative paths
+            if not parent_path.is_absolute():
+                parent_path = current.parent / parent_path
+            current = parent_path
+        else:
+            current = None
+
+    # Fold from the root down to the leaf, with each child overriding its parent
+    config: dict[str, Any] = {}
+    for depth, (_, raw) in enumerate(reversed(chain)):
+        layer = _normalize_config(raw)
+        config = _merge_configs(config, layer) if depth else layer
+
+    return config, sources
+
+
+def _normalize_config(raw: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return a normalized deep copy of a parsed config.
+
+    Nothing in the result is shared with the cached document, so callers may
+    mutate it freely, just like a config read back from the on-disk cache.
+    """
+    config = copy.deepcopy({key: value for key, value in raw.items() if key != "extends"})
+    config["env"] = config.get("env") or {}
+    config["flags"] = config.get("flags") or {}
+    config["hooks"] = config.get("hooks") or {}
     return config
 
 
-def _merge_configs(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:  # noqa: C901
+def _cache_file_for(config_file: Path) -> Path | None:
+    """Return the cache location for a config inside a .envlit directory, or None."""
+    if config_file.parent.name != ".envlit":
+        return None
+    return config_file.parent / ".cache" / f"{config_file.name}.json"
+
+
+def _read_cache(cache_file: Path) -> dict[str, Any] | None:
+    """Return the cached resolved config if it is still fresh, else None."""
+    try:
+        with open(cache_file, "rb") as f:
+            entry = json.load(f)
+        if entry["version"] != __version__:
+            return None
+        # Comparing the resolved path too catches a symlink retargeted to another file
+        for source in entry["sources"]:
+            stamp = _SourceStamp(*source)
+            if _source_stamp(Path(stamp.path)) != stamp:
+                return None
+        return entry["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cache(cache_file: Path, config: dict[str, Any], sources: list[_SourceStamp]) -> None:
+    """Store a resolved config; silently skipped if it can't be round-tripped or written."""
+    try:
+        # The stamps were taken when the sources were parsed, so a file edited
+        # since then can never be recorded as fresh
+        payload = json.dumps({
+            "version": __version__,
+            "sources": [list(stamp) for stamp in sources],
+            "config": config,
+        })
+        # Only primitive YAML types survive JSON unchanged (no dates, no non-string keys)
+        if json.loads(payload)["config"] != config:
+            return
+
+        cache_dir = cache_file.parent
+        if not cache_dir.is_dir():
+            cache_dir.mkdir()
+            (cache_dir / ".gitignore").write_text("# Created by envlit\n*\n")
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except (OSError, TypeError, ValueError):
+        return
+
+
+def _merge_configs(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
     """
     Merge two configurations with override taking precedence.
 
@@ -72,6 +233,8 @@ def _merge_configs(base: dict[str, Any], override: dict[str, Any]) -> dict[str,
     - flags: Shallow merge (override wins)
     - hooks: Deep merge (lists are concatenated)
 
+    Neither input is modified.
+
     Args:
         base: Base configuration.
         override: Override configuration.
@@ -79,33 +242,20 @@ def _merge_configs(base: dict[str, Any], override: dict[str, Any]) -> dict[str,
     Returns:
         Merged configuration.
     """
-    result = base.copy()
+    # Copy over any other keys in the same pass (override wins)
+    result = {**base, **{key: value for key, value in override.items() if key not in _MERGED_SECTIONS}}
 
-    # Merge env section (shallow merge, override wins)
+    # Merge env and flags sections (shallow merge, override wins)
     if "env" in override:
-        if "env" not in result:
-            result["env"] = {}
-        result["env"].update(override["env"])
-
-    # Merge flags section (shallow merge, override wins)
+        result["env"] = {**base.get("env", {}), **override["env"]}
     if "flags" in override:
-        if "flags" not in result:
-            result["flags"] = {}
-        result["flags"].update(override["flags"])
+        result["flags"] = {**base.get("flags", {}), **override["flags"]}
 
     # Merge hooks section (deep merge, lists concatenated)
     if "hooks" in override:
-        if "hooks" not in result:
-            result["hooks"] = {}
-        for hook_type in override["hooks"]:
-            if hook_type not in result["hooks"]:
-                result["hooks"][hook_type] = []
-            # Concatenate hook lists
-            result["hooks"][hook_type] = result["hooks"][hook_type] + override["hooks"][hook_type]
-
-    # Copy over any other keys
-    for key in override:
-        if key not in ["env", "flags", "hooks"]:
-            result[key] = override[key]
+        hooks = dict(base.get("hooks", {}))
+        for hook_type, hook_list in override["hooks"].items():
+            hooks[hook_type] = hooks.get(hook_type, []) + hook_list
+        result["hooks"] = hooks
 
     return result
@@ -2,6 +2,7 @@
 Constants used throughout envlit.
 """
 
+import functools
 import hashlib
 import os
 
@@ -9,28 +10,44 @@ import os
 SNAPSHOT_VAR_NAME = "__ENVLIT_SNAPSHOT_A"
 
 
-def get_hash_suffix() -> str:
+@functools.lru_cache(maxsize=8)
+def _hash_suffix_for(cwd: str) -> str:
+    # Keep the MD5 derivation: the suffix names state variables in already-open shells
+    return hashlib.md5(cwd.encode(), usedforsecurity=False).hexdigest()[:8]
+
+
+@functools.lru_cache(maxsize=8)
+def _state_var_name_for(cwd: str) -> str:
+    return f"__ENVLIT_STATE_{_hash_suffix_for(cwd)}"
+
+
+def get_hash_suffix(cwd: str | None = None) -> str:
     """
     Get the hash suffix based on current directory.
 
+    Results are memoized per directory, so repeated calls only cost a getcwd().
     Example: a1b2c3d4
 
+    Args:
+        cwd: Directory to hash (defaults to the current directory)
+
     Returns:
         Hash suffix
     """
-    cwd = os.getcwd()
-    hash_suffix = hashlib.md5(cwd.encode(), usedforsecurity=False).hexdigest()[:8]
-    return hash_suffix
+    return _hash_suffix_for(os.getcwd() if cwd is None else cwd)
 
 
-def get_state_var_name() -> str:
+def get_state_var_name(cwd: str | None = None) -> str:
     """
     Get the state variable name with a hash suffix based on current directory.
 
     This prevents collisions when running envlit in different directories.
     Example: __ENVLIT_STATE_a1b2c3d4
 
+    Args:
+        cwd: Directory the state belongs to (defaults to the current directory)
+
     Returns:
         State variable name with directory hash suffix
     """
-    return f"__ENVLIT_STATE_{get_hash_suffix()}"
+    return _state_var_name_for(os.getcwd() if cwd is None else cwd)
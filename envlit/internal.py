@@ -3,13 +3,16 @@ Internal tracking functionality for envlit.
 These functions are called by the generated shell scripts via the envlit-internal-track CLI command.
 """
 
-import json
 import os
 import shlex
 
+from envlit import _json
 from envlit.constants import SNAPSHOT_VAR_NAME, get_state_var_name
 from envlit.state import StateManager
 
+# Sentinel for keys missing from a snapshot (distinct from any JSON value)
+_MISSING = object()
+
 
 def track_begin() -> str:
     """
@@ -24,7 +27,7 @@ def track_begin() -> str:
     """
     # Return environment as JSON string
     snapshot = dict(os.environ)
-    return json.dumps(snapshot)
+    return _json.dumps(snapshot)
 
 
 def track_end() -> str:
@@ -33,47 +36,46 @@ def track_end() -> str:
     and update the __ENVLIT_STATE variable.
     """
     # Read Snapshot A (Start state)
-    snapshot_a_json = os.environ.get(SNAPSHOT_VAR_NAME, "{}")
+    snapshot_a_json = _json.getenv(SNAPSHOT_VAR_NAME) or "{}"
     try:
-        snapshot_a = json.loads(snapshot_a_json)
-    except json.JSONDecodeError:
+        snapshot_a = _json.loads(snapshot_a_json)
+    except _json.JSONDecodeError:
         # Fallback if the snapshot is corrupted
         snapshot_a = {}
 
     # Read Snapshot B (Current state)
     snapshot_b = dict(os.environ)
 
-    # Identify keys
-    keys_a = set(snapshot_a.keys())
-    keys_b = set(snapshot_b.keys())
-
     # Filter out the snapshot variable itself to avoid self-reference loops
-    keys_a.discard(SNAPSHOT_VAR_NAME)
-    keys_b.discard(SNAPSHOT_VAR_NAME)
+    snapshot_a.pop(SNAPSHOT_VAR_NAME, None)
+    snapshot_b.pop(SNAPSHOT_VAR_NAME, None)
 
-    # 1. Variables added or removed (Symmetric Difference)
-    changed_vars = {k: snapshot_b.get(k) for k in keys_a ^ keys_b}
+    # Nothing changed: the existing state variable is already correct
+    if snapshot_a == snapshot_b:
+        return "# envlit: no environment changes to track"
 
-    # 2. Variables present in both but with different values
-    common_keys = keys_a & keys_b
-    for k in common_keys:
-        if snapshot_a[k] != snapshot_b[k]:
-            changed_vars[k] = snapshot_b[k]
-
-    # Apply Compare-and-Swap
+    # Apply Compare-and-Swap for each difference as the diff is walked;
+    # actual_val is what it was at the start (Snapshot A)
     state_manager = StateManager()
 
-    # We only need to update the state manager if there are changes
-    if changed_vars:
-        for var_name, target_val in changed_vars.items():
-            # actual_val is what it was at the start (Snapshot A)
-            actual_val = snapshot_a.get(var_name)
-            state_manager.update_variable(var_name, actual_val, target_val)
+    # 1. Variables added, or present in both but with different values
+    for k, value_b in snapshot_b.items():
+        value_a = snapshot_a.get(k, _MISSING)
+        if value_a != value_b:
+            state_manager.update_variable(k, None if value_a is _MISSING else value_a, value_b)
+
+    # 2. Variables removed
+    for k, value_a in snapshot_a.items():
+        if k not in snapshot_b:
+            state_manager.update_variable(k, value_a, None)
 
     # Generate shell command
-    state_var = get_state_var_name()
-    updated_state = state_manager.get_state()
-    state_json = json.dumps(updated_state)
+    state_var = state_manager.state_var
+    state_json = state_manager.serialize()
+
+    # Without single quotes the payload can be wrapped as-is, skipping shlex's unsafe-char scan
+    if "'" not in state_json:
+        return f"export {state_var}='{state_json}'"
 
     # Use shlex for safe quoting (handles single quotes, spaces, etc.)
     return f"export {state_var}={shlex.quote(state_json)}"
@@ -90,13 +92,15 @@ def track_restore() -> str:
     if state_var not in os.environ:
         return "# No envlit state found to restore"
 
-    state_manager = StateManager()
+    state_manager = StateManager(state_var)
     tracked_vars = state_manager.get_tracked_variables()
 
     if not tracked_vars:
         return f"unset {state_var}"
 
-    commands = ["# Restoring environment to original state"]
+    parts = ["# Restoring environment to original state\n"]
+    # Originally-unset variables are cleared together in a single unset
+    to_unset = []
 
     for var_name in tracked_vars:
         current_tracked = state_manager.get_current_value(var_name)
@@ -111,13 +115,16 @@ def track_restore() -> str:
 
         if original is None:
             # Variable was originally unset, so we unset it now
-            commands.append(f"unset {var_name}")
+            to_unset.append(var_name)
         else:
             # Variable had a value, restore it safely
             # shlex.quote ensures that $VAR, `cmd`, and spaces are treated as literals
-            commands.append(f"export {var_name}={shlex.quote(original)}")
+            parts.extend(("export ", var_name, "=", shlex.quote(original), "\n"))
+
+    if to_unset:
+        parts.extend(("unset ", " ".join(to_unset), "\n"))
 
     # Clear the internal state variable last
-    commands.append(f"unset {state_var}")
+    parts.extend(("unset ", state_var))
 
-    return "\n".join(commands)
+    return "".join(parts)
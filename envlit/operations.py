@@ -3,9 +3,157 @@ Atomic environment variable operations.
 Each operation is a pure function: (current_value, op_config) -> new_value
 """
 
+import functools
+from collections.abc import Callable
 from typing import Any
 
 
+def _has_empty_entry(value: str, separator: str) -> bool:
+    """Whether splitting value on separator yields an empty entry."""
+    return value.startswith(separator) or value.endswith(separator) or separator * 2 in value
+
+
+def _op_set(current_value: str | None, operation: dict[str, Any]) -> str | None:
+    return str(operation["value"])
+
+
+def _op_unset(current_value: str | None, operation: dict[str, Any]) -> str | None:
+    return None
+
+
+def _dedup(value: str, separator: str) -> str:
+    """Drop repeated entries, keeping the first occurrence of each."""
+    return separator.join(dict.fromkeys(value.split(separator)))
+
+
+def _op_prepend(current_value: str | None, operation: dict[str, Any]) -> str | None:
+    value = str(operation["value"])
+    if current_value is None or current_value == "":
+        return value
+    separator = operation.get("separator", ":")
+    result = f"{value}{separator}{current_value}"
+    return _dedup(result, separator) if operation.get("dedup") else result
+
+
+def _op_append(current_value: str | None, operation: dict[str, Any]) -> str | None:
+    value = str(operation["value"])
+    if current_value is None or current_value == "":
+        return value
+    separator = operation.get("separator", ":")
+    result = f"{current_value}{separator}{value}"
+    return _dedup(result, separator) if operation.get("dedup") else result
+
+
+def _op_remove(current_value: str | None, operation: dict[str, Any]) -> str | None:
+    value = str(operation["value"])
+    separator = operation.get("separator", ":")
+    if current_value is None or current_value == "":
+        return None
+    # Nothing to remove and no empty entries to drop: skip the split/join.
+    # Matching on separator boundaries keeps /bin inside /usr/bin from counting as present.
+    present = f"{separator}{value}{separator}" in f"{separator}{current_value}{separator}"
+    if not present and not _has_empty_entry(current_value, separator):
+        return current_value
+    parts = [p for p in current_value.split(separator) if p and p != value]
+    return separator.join(parts) if parts else None
+
+
+# Operation name -> handler(current_value, operation)
+_OPS = {
+    "set": _op_set,
+    "unset": _op_unset,
+    "prepend": _op_prepend,
+    "append": _op_append,
+    "remove": _op_remove,
+}
+
+_VALID_OPS = frozenset(_OPS)
+_NEEDS_VALUE = frozenset({"set", "prepend", "append", "remove"})
+_DEDUP_OPS = frozenset({"prepend", "append"})
+
+# Operations that edit a separator-delimited list and can be fused into one pass
+_LIST_OPS = frozenset({"prepend", "append", "remove"})
+
+
+def _is_fusable(operation: dict[str, Any]) -> bool:
+    """
+    Whether operation is a list edit the fused path can apply.
+
+    Only single-character separators qualify: split entries can never contain them,
+    so joining and re-splitting is lossless. With a separator like "::", entries
+    such as "a:" would merge across the boundary.
+    """
+    separator = operation.get("separator", ":")
+    return operation.get("op") in _LIST_OPS and type(separator) is str and len(separator) == 1
+
+
+def _fused_span_end(operations: list[dict[str, Any]], start: int) -> int:
+    """
+    End of the span from the remove at start through the last remove of its fusable run.
+
+    Fusing only pays off when the span holds two or more removes, which then share
+    one split/join instead of each rebuilding the value. A plain prepend/append is a
+    single string concatenation, so those before the first and after the last
+    remove stay outside the span. A result of start + 1 means nothing to fuse.
+    """
+    end = start + 1
+    for j in range(start + 1, len(operations)):
+        if not _is_fusable(operations[j]):
+            break
+        if operations[j]["op"] == "remove":
+            end = j + 1
+    return end
+
+
+def _apply_list_ops_fused(current_value: str | None, operations: list[dict[str, Any]]) -> str | None:  # noqa: C901
+    """
+    Apply a run of prepend/append/remove operations.
+
+    The value is split into a list once and joined once, re-splitting only where
+    the separator changes between operations; the result is identical to applying
+    the operations one by one.
+    """
+    separator = operations[0].get("separator", ":")
+    # None mirrors an unset variable; [""] is the split of an empty string
+    parts = None if current_value is None else current_value.split(separator)
+    i = 0
+    n = len(operations)
+    while i < n:
+        operation = operations[i]
+        op_separator = operation.get("separator", ":")
+        if op_separator != separator:
+            # Same as joining to a string and splitting it again, as the next op would
+            if parts is not None:
+                parts = separator.join(parts).split(op_separator)
+            separator = op_separator
+
+        if operation["op"] == "remove":
+            # Consecutive removes on the same separator filter in a single pass
+            values = {str(operation["value"])}
+            i += 1
+            while i < n and operations[i]["op"] == "remove" and operations[i].get("separator", ":") == separator:
+                values.add(str(operations[i]["value"]))
+                i += 1
+            if parts == [""]:
+                parts = None
+            elif parts is not None:
+                parts = [p for p in parts if p and p not in values] or None
+            continue
+
+        added = str(operation["value"]).split(separator)
+        if parts is None or parts == [""]:
+            parts = added
+        else:
+            if operation["op"] == "prepend":
+                parts = added + parts
+            else:
+                parts.extend(added)
+            if operation.get("dedup"):
+                parts = list(dict.fromkeys(parts))
+        i += 1
+    return None if parts is None else separator.join(parts)
+
+
 def apply_operation(current_value: str | None, operation: dict[str, Any]) -> str | None:
     """
     Apply a single atomic operation to a value.
@@ -20,38 +168,13 @@ def apply_operation(current_value: str | None, operation: dict[str, Any]) -> str
     Raises:
         ValueError: If operation is invalid
     """
-    op = operation.get("op")
-
-    if op == "set":
-        return str(operation["value"])
-
-    elif op == "unset":
-        return None
-
-    elif op == "prepend":
-        value = str(operation["value"])
-        separator = operation.get("separator", ":")
-        if current_value is None or current_value == "":
-            return value
-        return f"{value}{separator}{current_value}"
-
-    elif op == "append":
-        value = str(operation["value"])
-        separator = operation.get("separator", ":")
-        if current_value is None or current_value == "":
-            return value
-        return f"{current_value}{separator}{value}"
-
-    elif op == "remove":
-        value = str(operation["value"])
-        separator = operation.get("separator", ":")
-        if current_value is None or current_value == "":
-            return None
-        parts = [p for p in current_value.split(separator) if p and p != value]
-        return separator.join(parts) if parts else None
-
-    else:
-        raise ValueError(f"Unknown operation: {op}")
+    # Any: op comes from user config and may be missing or unhashable; both are reported below
+    op: Any = operation.get("op")
+    try:
+        handler = _OPS[op]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown operation: {op}") from None
+    return handler(current_value, operation)
 
 
 def apply_operations(initial_value: str | None, operations: list[dict[str, Any]]) -> str | None:
@@ -65,9 +188,24 @@ def apply_operations(initial_value: str | None, operations: list[dict[str, Any]]
     Returns:
         Final value after all operations
     """
+    n = len(operations)
+    if n == 1:
+        # Most env entries normalize to a single operation
+        return apply_operation(initial_value, operations[0])
+
     current = initial_value
-    for op in operations:
-        current = apply_operation(current, op)
+    i = 0
+    while i < n:
+        operation = operations[i]
+        if operation.get("op") == "remove" and _is_fusable(operation):
+            # Repeated removes share one split/join
+            end = _fused_span_end(operations, i)
+            if end - i > 1:
+                current = _apply_list_ops_fused(current, operations[i:end])
+                i = end
+                continue
+        current = apply_operation(current, operation)
+        i += 1
     return current
 
 
@@ -85,19 +223,57 @@ def validate_operation(operation: dict[str, Any]) -> None:
         raise ValueError("Operation must have 'op' field")
 
     op = operation["op"]
-    valid_ops = ["set", "unset", "prepend", "append", "remove"]
 
-    if op not in valid_ops:
-        raise ValueError(f"Invalid operation '{op}'. Must be one of: {valid_ops}")
+    # The str check keeps unhashable values (e.g. a YAML list) out of the frozenset lookup
+    if not isinstance(op, str) or op not in _VALID_OPS:
+        raise ValueError(f"Invalid operation '{op}'. Must be one of: {list(_OPS)}")
 
     # Operations that require 'value'
-    if op in ["set", "prepend", "append", "remove"] and "value" not in operation:
+    if op in _NEEDS_VALUE and "value" not in operation:
         raise ValueError(f"Operation '{op}' requires 'value' field")
 
     # Operations that should NOT have 'value'
     if op == "unset" and "value" in operation:
         raise ValueError(f"Operation '{op}' should not have 'value' field")
 
+    if "dedup" in operation:
+        if op not in _DEDUP_OPS:
+            raise ValueError(f"Operation '{op}' does not support 'dedup' field")
+        if not isinstance(operation["dedup"], bool):
+            raise ValueError(f"Operation '{op}' requires 'dedup' to be true or false")
+
+
+def _normalize_none(value: None) -> list[dict[str, Any]]:
+    # None/null means unset
+    return [{"op": "unset"}]
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_str(value: str) -> list[dict[str, Any]]:
+    # String shorthand for set operation
+    return [{"op": "set", "value": value}]
+
+
+def _normalize_dict(value: dict[str, Any]) -> list[dict[str, Any]]:
+    # Single operation
+    return [value]
+
+
+def _normalize_list(value: list[Any]) -> list[dict[str, Any]]:
+    # Pipeline of operations
+    if not all(isinstance(item, dict) for item in value):
+        raise ValueError("List must contain only operation dictionaries")
+    return value
+
+
+# Exact value type -> normalizer; subclasses fall back to the isinstance checks
+_NORMALIZERS: dict[type, Callable[[Any], list[dict[str, Any]]]] = {
+    type(None): _normalize_none,
+    str: _normalize_str,
+    dict: _normalize_dict,
+    list: _normalize_list,
+}
+
 
 def normalize_env_value(value: Any) -> list[dict[str, Any]]:
     """
@@ -108,6 +284,9 @@ def normalize_env_value(value: Any) -> list[dict[str, Any]]:
     - Dict: Converted to [dict] (single operation)
     - List of dicts: Returned as-is (pipeline of operations)
 
+    String results are memoized, so the returned list may be shared between calls
+    and must not be mutated.
+
     Args:
         value: The value from the env section of config
 
@@ -117,19 +296,16 @@ def normalize_env_value(value: Any) -> list[dict[str, Any]]:
     Raises:
         ValueError: If value format is invalid
     """
-    if value is None:
-        # None/null means unset
-        return [{"op": "unset"}]
-    elif isinstance(value, str):
-        # String shorthand for set operation
-        return [{"op": "set", "value": value}]
+    handler = _NORMALIZERS.get(type(value))
+    if handler is not None:
+        return handler(value)
+
+    if isinstance(value, str):
+        # Uncached: str subclasses hash like plain strings and would alias their entries
+        return _normalize_str.__wrapped__(value)
     elif isinstance(value, dict):
-        # Single operation
-        return [value]
+        return _normalize_dict(value)
     elif isinstance(value, list):
-        # Pipeline of operations
-        if not all(isinstance(item, dict) for item in value):
-            raise ValueError("List must contain only operation dictionaries")
-        return value
+        return _normalize_list(value)
     else:
-        raise ValueError(f"Invalid env value type: {type(value).__name__}")
+        raise ValueError(f"Invalid env value type: {type(value).__name__}")  # noqa: TRY004
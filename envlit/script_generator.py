@@ -10,7 +10,36 @@ from typing import Any
 from envlit.constants import SNAPSHOT_VAR_NAME
 from envlit.operations import apply_operations, normalize_env_value, validate_operation
 
-_VALID_VAR_NAME = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+# Used with fullmatch: "$" alone would also accept a trailing newline
+_VALID_VAR_NAME = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+
+# Matches $VAR and ${VAR} with optional modifiers (:-default, :0:5, /old/new, etc.)
+# and the ${#VAR} length operator. Does NOT support nested expansions like
+# ${VAR:-${OTHER}} — the inner } would terminate the match early.
+_VAR_PATTERN = re.compile(
+    r"\$([a-zA-Z_][a-zA-Z0-9_]*)"  # Simple $var
+    r"|\${#?([a-zA-Z_][a-zA-Z0-9_]*)(?::?[^}]*)?}"  # ${var} or ${#var} with modifiers
+)
+
+# Characters that are special inside double quotes.
+# Note: real newlines (\x0a) become the two-char sequence \n here, which bash
+# does NOT interpret as a newline inside double quotes. Use interpolate: false
+# (single-quote mode) if the value contains literal newlines.
+_INTERPOLATED_ESCAPES = str.maketrans({"\\": "\\\\", "$": "\\$", "`": "\\`", '"': '\\"', "\n": "\\n"})
+# Values containing none of those characters are returned unchanged
+_NEEDS_ESCAPE = re.compile(r'[\\$`"\n]')
+
+
+# One rendered hook: a comment naming it, then its script
+_HOOK_TEMPLATE = "# Hook: %(name)s\n%(script)s"
+
+
+def _append_hooks(lines: list[str], config: dict[str, Any], hook_type: str, heading: str) -> None:
+    """Append the configured hooks of hook_type, if any, under a heading comment."""
+    if "hooks" in config and hook_type in config["hooks"]:
+        lines.append(heading)
+        lines.extend(_HOOK_TEMPLATE % hook for hook in config["hooks"][hook_type])
+        lines.append("")
 
 
 def _is_inline_flag(var_value: Any) -> bool:
@@ -63,12 +92,7 @@ def generate_load_script(config: dict[str, Any], flag_overrides: dict[str, str]
     lines.append("")
 
     # 2. Pre-load hooks
-    if "hooks" in config and "pre_load" in config["hooks"]:
-        lines.append("# Pre-load hooks")
-        for hook in config["hooks"]["pre_load"]:
-            lines.append(f"# Hook: {hook['name']}")
-            lines.append(hook["script"])
-        lines.append("")
+    _append_hooks(lines, config, "pre_load", "# Pre-load hooks")
 
     # 3. Environment variable exports
     lines.append("# Environment variables")
@@ -99,7 +123,7 @@ def generate_load_script(config: dict[str, Any], flag_overrides: dict[str, str]
                         env_section[target_var] = flag_value
 
     for var_name, var_value in env_section.items():
-        if not _VALID_VAR_NAME.match(var_name):
+        if not _VALID_VAR_NAME.fullmatch(var_name):
             raise ValueError(f"Invalid environment variable name '{var_name}': must match [a-zA-Z_][a-zA-Z0-9_]*")
         try:
             # Extract interpolate flag (only meaningful on single-dict ops)
@@ -133,12 +157,7 @@ def generate_load_script(config: dict[str, Any], flag_overrides: dict[str, str]
     lines.append("")
 
     # 4. Post-load hooks
-    if "hooks" in config and "post_load" in config["hooks"]:
-        lines.append("# Post-load hooks")
-        for hook in config["hooks"]["post_load"]:
-            lines.append(f"# Hook: {hook['name']}")
-            lines.append(hook["script"])
-        lines.append("")
+    _append_hooks(lines, config, "post_load", "# Post-load hooks")
 
     # 5. End tracking - use temp file for Bash 3.2 compatibility (macOS default)
     lines.append("# Capture ending state and update state record")
@@ -172,12 +191,7 @@ def generate_unload_script(config: dict[str, Any]) -> str:
     lines = ["#!/bin/bash", "# Generated by envlit unload", ""]
 
     # 1. Pre-unload hooks
-    if "hooks" in config and "pre_unload" in config["hooks"]:
-        lines.append("# Pre-unload hooks")
-        for hook in config["hooks"]["pre_unload"]:
-            lines.append(f"# Hook: {hook['name']}")
-            lines.append(hook["script"])
-        lines.append("")
+    _append_hooks(lines, config, "pre_unload", "# Pre-unload hooks")
 
     # 2. Restore original state - use temp file for Bash 3.2 compatibility (macOS default)
     lines.append("# Restore original environment state")
@@ -188,12 +202,7 @@ def generate_unload_script(config: dict[str, Any]) -> str:
     lines.append("")
 
     # 3. Post-unload hooks
-    if "hooks" in config and "post_unload" in config["hooks"]:
-        lines.append("# Post-unload hooks")
-        for hook in config["hooks"]["post_unload"]:
-            lines.append(f"# Hook: {hook['name']}")
-            lines.append(hook["script"])
-        lines.append("")
+    _append_hooks(lines, config, "post_unload", "# Post-unload hooks")
 
     return "\n".join(lines)
 
@@ -206,40 +215,19 @@ def _escape_interpolated(value: str) -> str:
     To include a literal $ alongside variable expansion, use interpolate: false
     for the whole value instead.
     """
-    # Step 1: Stash all $VAR / ${…} patterns so they survive escaping
-    var_refs: dict[str, str] = {}
-    var_counter = [0]
-
-    def replace_var(match: re.Match) -> str:
-        placeholder = f"__ENVLIT_VAR_{var_counter[0]}__"
-        var_refs[placeholder] = match.group(0)
-        var_counter[0] += 1
-        return placeholder
-
-    # Matches $VAR and ${VAR} with optional modifiers (:-default, :0:5, /old/new, etc.)
-    # and the ${#VAR} length operator. Does NOT support nested expansions like
-    # ${VAR:-${OTHER}} — the inner } would terminate the match early.
-    VAR_PATTERN = re.compile(
-        r"\$([a-zA-Z_][a-zA-Z0-9_]*)"  # Simple $var
-        r"|\${#?([a-zA-Z_][a-zA-Z0-9_]*)(?::?[^}]*)?}"  # ${var} or ${#var} with modifiers
-    )
-    temp_value = VAR_PATTERN.sub(replace_var, value)
-
-    # Step 2: Escape characters that are special inside double quotes.
-    # Note: real newlines (\x0a) become the two-char sequence \n here, which bash
-    # does NOT interpret as a newline inside double quotes. Use interpolate: false
-    # (single-quote mode) if the value contains literal newlines.
-    temp_value = temp_value.replace("\\", "\\\\")
-    temp_value = temp_value.replace("$", "\\$")
-    temp_value = temp_value.replace("`", "\\`")
-    temp_value = temp_value.replace('"', '\\"')
-    temp_value = temp_value.replace("\n", "\\n")
-
-    # Step 3: Restore variable references verbatim
-    for placeholder, original in var_refs.items():
-        temp_value = temp_value.replace(placeholder, original)
-
-    return temp_value
+    # Most values (plain paths, flags, versions) contain nothing to escape
+    if _NEEDS_ESCAPE.search(value) is None:
+        return value
+
+    # Copy variable references verbatim and escape the text between them
+    parts = []
+    pos = 0
+    for match in _VAR_PATTERN.finditer(value):
+        parts.append(value[pos : match.start()].translate(_INTERPOLATED_ESCAPES))
+        parts.append(match.group(0))
+        pos = match.end()
+    parts.append(value[pos:].translate(_INTERPOLATED_ESCAPES))
+    return "".join(parts)
 
 
 def _escape_literal(value: str) -> str:
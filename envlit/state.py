@@ -3,20 +3,45 @@ State management for envlit.
 Implements the Compare-and-Swap algorithm for tracking environment variable changes.
 """
 
-import json
+import functools
 import os
-from typing import Any
+from typing import Any, NamedTuple
 
+from envlit import _json
 from envlit.constants import get_state_var_name
 
 
+class _StateTables(NamedTuple):
+    """State records as two parallel dicts keyed by variable name."""
+
+    original: dict[str, str | None]
+    current: dict[str, str | None]
+
+
 class StateManager:
     """Manages the state record for environment variables."""
 
-    def __init__(self):
-        """Initialize StateManager and load existing state."""
-        self.state_var = get_state_var_name()
-        self._state = self._load_state()
+    def __init__(self, state_var: str | None = None):
+        """
+        Initialize StateManager. Existing state is loaded on first use.
+
+        Args:
+            state_var: Name of the state variable, if the caller already resolved it
+                (defaults to get_state_var_name()).
+        """
+        self.state_var = state_var or get_state_var_name()
+        # Output of serialize(), cleared whenever a record changes
+        self._serialized: str | None = None
+
+    @functools.cached_property
+    def _tables(self) -> _StateTables:
+        """Records loaded from the state variable, split into original and current tables."""
+        original: dict[str, str | None] = {}
+        current: dict[str, str | None] = {}
+        for var_name, record in self._load_state().items():
+            original[var_name] = record.get("original")
+            current[var_name] = record.get("current")
+        return _StateTables(original, current)
 
     def _load_state(self) -> dict[str, dict[str, Any]]:
         """
@@ -27,15 +52,29 @@ class StateManager:
             Each record contains 'original' and 'current' keys.
             Returns empty dict if no state exists.
         """
-        state_json = os.environ.get(self.state_var, "{}")
+        state_json = _json.getenv(self.state_var)
+        if state_json is None:
+            return {}
         try:
-            return json.loads(state_json)
-        except json.JSONDecodeError:
+            return _json.loads(state_json)
+        except _json.JSONDecodeError:
             return {}
 
     def get_state(self) -> dict[str, dict[str, Any]]:
-        """Get the current state dictionary."""
-        return self._state
+        """Get the current state dictionary in its serialized (nested) form."""
+        original, current = self._tables
+        return {var_name: {"original": original[var_name], "current": value} for var_name, value in current.items()}
+
+    def serialize(self) -> str:
+        """
+        Serialize the state for export into the state variable.
+
+        Keys are sorted so identical state always produces the same string.
+        The result is reused until update_variable changes a record.
+        """
+        if self._serialized is None:
+            self._serialized = _json.dumps(self.get_state(), sort_keys=True)
+        return self._serialized
 
     def update_variable(
         self,
@@ -56,34 +95,32 @@ class StateManager:
             actual_val: Current value in the environment (None if unset).
             target_val: Desired value to set (None to unset).
         """
-        if var_name not in self._state:
+        original, current = self._tables
+        if var_name not in current:
             # Scenario 1: New Variable
-            self._state[var_name] = {"original": actual_val, "current": target_val}
-        elif actual_val == self._state[var_name]["current"]:
-            # Scenario 2: Consecutive Load (no manual interference)
-            # Keep original, update current
-            self._state[var_name]["current"] = target_val
-        else:
+            original[var_name] = actual_val
+        elif actual_val != current[var_name]:
             # Scenario 3: Manual Interference detected
-            # Update original to reflect user's manual change, set new current
-            self._state[var_name]["original"] = actual_val
-            self._state[var_name]["current"] = target_val
+            # Update original to reflect user's manual change
+            original[var_name] = actual_val
+        elif target_val == current[var_name]:
+            # Scenario 2 with an unchanged value: nothing to record
+            return
+        # Scenario 2: Consecutive Load (no manual interference) keeps the original
+        current[var_name] = target_val
+        self._serialized = None
 
     def get_original_value(self, var_name: str) -> str | None:
         """Get the original value of a tracked variable."""
-        if var_name in self._state:
-            return self._state[var_name]["original"]
-        return None
+        return self._tables.original.get(var_name)
 
     def get_current_value(self, var_name: str) -> str | None:
         """Get the current value of a tracked variable."""
-        if var_name in self._state:
-            return self._state[var_name]["current"]
-        return None
+        return self._tables.current.get(var_name)
 
     def get_tracked_variables(self) -> list[str]:
         """Get list of all tracked variable names."""
-        return list(self._state.keys())
+        return list(self._tables.current)
 
     def get_env_dict(self, from_env: bool = False) -> dict[str, str]:
         """
@@ -95,14 +132,8 @@ class StateManager:
         Returns:
             Dictionary mapping variable names to values
         """
-        result = {}
-        for var_name in self.get_tracked_variables():
-            if from_env:
-                value = os.environ.get(var_name)
-                if value is not None:
-                    result[var_name] = value
-            else:
-                value = self.get_current_value(var_name)
-                if value is not None:
-                    result[var_name] = value
-        return result
+        current = self._tables.current
+        if from_env:
+            environ = os.environ
+            return {var_name: environ[var_name] for var_name in current if var_name in environ}
+        return {var_name: value for var_name, value in current.items() if value is not None}
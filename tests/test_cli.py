@@ -2,6 +2,8 @@
 Tests for CLI commands: find_config_file, load error paths, doctor.
 """
 
+from pathlib import Path
+
 import pytest
 from click.testing import CliRunner
 
@@ -63,6 +65,28 @@ class TestFindConfigFile:
         f.write_text("env: {}")
         assert find_config_file(profile=None, search_dir=tmp_path) == f
 
+    def test_symlinked_profile(self, tmp_path):
+        d = tmp_path / ".envlit"
+        d.mkdir()
+        target = d / "dev.yaml"
+        target.write_text("env: {}")
+        link = d / "default.yaml"
+        link.symlink_to(target)
+        assert find_config_file(search_dir=tmp_path) == link
+
+    def test_case_insensitive_filesystem_fallback(self, tmp_path, monkeypatch):
+        d = tmp_path / ".envlit"
+        d.mkdir()
+        (d / "dev.yaml").write_text("env: {}")
+        # Emulate a case-insensitive filesystem for the direct probe
+        is_file = Path.is_file
+        monkeypatch.setattr(Path, "is_file", lambda self: is_file(self.with_name(self.name.lower())))
+        assert find_config_file(profile="Dev", search_dir=tmp_path) == d / "Dev.yaml"
+
+    def test_envlit_is_a_file(self, tmp_path):
+        (tmp_path / ".envlit").write_text("")
+        assert find_config_file(search_dir=tmp_path) is None
+
 
 # ---------------------------------------------------------------------------
 # load — error paths
@@ -106,6 +130,13 @@ class TestLoadErrors:
         # Error may surface from DynamicFlagCommand.parse_args or load() body
         assert result.output  # some error message is emitted
 
+    def test_missing_config_path(self, runner, tmp_path):
+        """load reports a missing --config file with its own message."""
+        missing = tmp_path / "missing.yaml"
+        result = runner.invoke(cli, ["load", "--config", str(missing)])
+        assert result.exit_code != 0
+        assert "Config file not found" in result.output
+
     def test_valid_config_succeeds(self, runner, tmp_path):
         """load succeeds and emits a sourceable script for a valid config."""
         cfg = tmp_path / "ok.yaml"
@@ -115,6 +146,84 @@ class TestLoadErrors:
         assert 'export FOO="bar"' in result.output
 
 
+# ---------------------------------------------------------------------------
+# load — argument forms
+# ---------------------------------------------------------------------------
+
+
+class TestLoadArguments:
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        cfg = tmp_path / "ok.yaml"
+        cfg.write_text('env:\n  ARG_TEST_DEVICE:\n    flag: ["--arg-device", "-D"]\n    default: "0"\n')
+        return cfg
+
+    def test_config_equals_form(self, runner, config_file):
+        result = runner.invoke(cli, ["load", f"--config={config_file}", "--arg-device", "3"])
+        assert result.exit_code == 0
+        assert 'export ARG_TEST_DEVICE="3"' in result.output
+
+    def test_config_attached_short_form(self, runner, config_file):
+        result = runner.invoke(cli, ["load", f"-c{config_file}", "-D", "2"])
+        assert result.exit_code == 0
+        assert 'export ARG_TEST_DEVICE="2"' in result.output
+
+    def test_profile_after_flag_with_equals(self, runner, tmp_path, monkeypatch):
+        envlit_dir = tmp_path / ".envlit"
+        envlit_dir.mkdir()
+        (envlit_dir / "dev.yaml").write_text('env:\n  ARG_TEST_DEVICE:\n    flag: "--arg-device"\n    default: "0"\n')
+        monkeypatch.chdir(tmp_path)
+        result = runner.invoke(cli, ["load", "--arg-device=5", "dev"])
+        assert result.exit_code == 0
+        assert 'export ARG_TEST_DEVICE="5"' in result.output
+
+
+# ---------------------------------------------------------------------------
+# unload
+# ---------------------------------------------------------------------------
+
+
+class TestUnload:
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    def test_missing_config_path(self, runner, tmp_path):
+        missing = tmp_path / "missing.yaml"
+        result = runner.invoke(cli, ["unload", "--config", str(missing)])
+        assert result.exit_code != 0
+        assert "Config file not found" in result.output
+
+
+# ---------------------------------------------------------------------------
+# state
+# ---------------------------------------------------------------------------
+
+
+class TestState:
+    @pytest.fixture
+    def runner(self):
+        return CliRunner()
+
+    def test_escapes_quotes_and_backslashes(self, runner, monkeypatch):
+        from envlit import _json
+        from envlit.constants import get_state_var_name
+
+        state = {
+            "PLAIN": {"original": None, "current": "value"},
+            "QUOTED": {"original": None, "current": 'say "hi" C:\\tmp'},
+        }
+        monkeypatch.setenv(get_state_var_name(), _json.dumps(state))
+        result = runner.invoke(cli, ["state"])
+        assert result.exit_code == 0
+        assert "PLAIN=value" in result.output
+        assert 'QUOTED="say \\"hi\\" C:\\\\tmp"' in result.output
+
+
 # ---------------------------------------------------------------------------
 # doctor
 # ---------------------------------------------------------------------------
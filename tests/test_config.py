@@ -2,9 +2,14 @@
 Tests for configuration parsing and management.
 """
 
+import errno
+import io
+import os
+
 import pytest
 import yaml
 
+from envlit import config as config_module
 from envlit.config import load_config
 
 
@@ -199,6 +204,24 @@ hooks:
         # post_load should only have derived hook
         assert len(config["hooks"]["post_load"]) == 1
 
+    def test_config_inheritance_multi_level(self, tmp_path):
+        """Test a grandparent -> parent -> child extends chain."""
+        (tmp_path / "root.yaml").write_text("env:\n  ROOT_VAR: root\n  SHARED_VAR: root\n")
+        (tmp_path / "middle.yaml").write_text("extends: ./root.yaml\nenv:\n  SHARED_VAR: middle\n")
+        leaf_file = tmp_path / "leaf.yaml"
+        leaf_file.write_text("extends: ./middle.yaml\nenv:\n  LEAF_VAR: leaf\n")
+
+        config = load_config(str(leaf_file))
+        assert config["env"] == {"ROOT_VAR": "root", "SHARED_VAR": "middle", "LEAF_VAR": "leaf"}
+        assert "extends" not in config
+
+    def test_config_inheritance_cycle(self, tmp_path):
+        """Test that a circular extends chain is reported."""
+        (tmp_path / "a.yaml").write_text("extends: ./b.yaml\n")
+        (tmp_path / "b.yaml").write_text("extends: ./a.yaml\n")
+        with pytest.raises(ValueError, match="Circular"):
+            load_config(str(tmp_path / "a.yaml"))
+
     def test_empty_config(self, tmp_path):
         """Test loading an empty config."""
         config_file = tmp_path / "empty.yaml"
@@ -256,3 +279,143 @@ flags: {}
         with warnings.catch_warnings():
             warnings.simplefilter("error", DeprecationWarning)
             load_config(str(config_file))  # should not raise
+
+    def test_repeated_load_is_not_affected_by_mutation(self, tmp_path):
+        """Mutating a loaded config must not leak into later loads of the same file."""
+        config_file = tmp_path / "cached.yaml"
+        config_file.write_text("""
+env:
+  MY_VAR: "value"
+  PATH:
+    op: prepend
+    value: /opt/bin
+hooks:
+  pre_load:
+    - name: "Greet"
+      script: "echo hi"
+""")
+        first = load_config(str(config_file))
+        first["env"]["MY_VAR"] = "mutated"
+        first["env"]["EXTRA"] = "added"
+        first["env"]["PATH"]["value"] = "/evil"
+        first["hooks"]["pre_load"][0]["script"] = "rm"
+        first["hooks"]["pre_load"].append({"name": "Extra", "script": "true"})
+
+        second = load_config(str(config_file))
+        assert second["env"] == {"MY_VAR": "value", "PATH": {"op": "prepend", "value": "/opt/bin"}}
+        assert second["hooks"] == {"pre_load": [{"name": "Greet", "script": "echo hi"}]}
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """Editing a config file invalidates the parsed-config cache."""
+        config_file = tmp_path / "edited.yaml"
+        config_file.write_text("env:\n  MY_VAR: old\n")
+        assert load_config(str(config_file))["env"]["MY_VAR"] == "old"
+
+        config_file.write_text("env:\n  MY_VAR: changed\n")
+        assert load_config(str(config_file))["env"]["MY_VAR"] == "changed"
+
+
+class TestConfigCache:
+    """Test the on-disk cache of resolved configs in .envlit/.cache."""
+
+    def test_cache_written_for_envlit_configs(self, tmp_path):
+        envlit_dir = tmp_path / ".envlit"
+        envlit_dir.mkdir()
+        config_file = envlit_dir / "default.yaml"
+        config_file.write_text("env:\n  MY_VAR: value\n")
+
+        config = load_config(str(config_file))
+
+        cache_file = envlit_dir / ".cache" / "default.yaml.json"
+        assert cache_file.is_file()
+        assert (envlit_dir / ".cache" / ".gitignore").is_file()
+        assert load_config(str(config_file)) == config
+
+    def test_no_cache_outside_envlit_dir(self, tmp_path):
+        config_file = tmp_path / "plain.yaml"
+        config_file.write_text("env:\n  MY_VAR: value\n")
+        load_config(str(config_file))
+        assert not (tmp_path / ".cache").exists()
+
+    def test_cache_invalidated_when_parent_changes(self, tmp_path):
+        envlit_dir = tmp_path / ".envlit"
+        envlit_dir.mkdir()
+        base_file = envlit_dir / "base.yaml"
+        base_file.write_text("env:\n  BASE_VAR: old\n")
+        derived_file = envlit_dir / "dev.yaml"
+        derived_file.write_text("extends: ./base.yaml\nenv:\n  DEV_VAR: value\n")
+
+        assert load_config(str(derived_file))["env"]["BASE_VAR"] == "old"
+
+        base_file.write_text("env:\n  BASE_VAR: updated\n")
+        config = load_config(str(derived_file))
+        assert config["env"]["BASE_VAR"] == "updated"
+        assert config["env"]["DEV_VAR"] == "value"
+
+    def test_non_json_values_are_not_cached(self, tmp_path):
+        envlit_dir = tmp_path / ".envlit"
+        envlit_dir.mkdir()
+        config_file = envlit_dir / "default.yaml"
+        config_file.write_text("released: 2024-01-01\nenv: {}\n")
+
+        config = load_config(str(config_file))
+
+        assert not (envlit_dir / ".cache" / "default.yaml.json").exists()
+        assert str(config["released"]) == "2024-01-01"
+
+    def test_cache_invalidated_when_symlink_retargeted(self, tmp_path):
+        envlit_dir = tmp_path / ".envlit"
+        envlit_dir.mkdir()
+        first = envlit_dir / "first.yaml"
+        first.write_text("env:\n  MY_VAR: one\n")
+        second = envlit_dir / "second.yaml"
+        second.write_text("env:\n  MY_VAR: two\n")
+        # Same mtime and size, so only the link target tells them apart
+        st = first.stat()
+        os.utime(second, ns=(st.st_atime_ns, st.st_mtime_ns))
+        link = envlit_dir / "default.yaml"
+        link.symlink_to(first.name)
+
+        assert load_config(str(link))["env"]["MY_VAR"] == "one"
+
+        link.unlink()
+        link.symlink_to(second.name)
+        assert load_config(str(link))["env"]["MY_VAR"] == "two"
+
+    def test_cache_not_fresh_when_source_changes_after_parse(self, tmp_path, monkeypatch):
+        envlit_dir = tmp_path / ".envlit"
+        envlit_dir.mkdir()
+        config_file = envlit_dir / "default.yaml"
+        config_file.write_text("env:\n  MY_VAR: old\n")
+
+        resolve_config = config_module._resolve_config
+
+        def edit_after_parse(path):
+            result = resolve_config(path)
+            config_file.write_text("env:\n  MY_VAR: updated\n")
+            return result
+
+        monkeypatch.setattr(config_module, "_resolve_config", edit_after_parse)
+        assert load_config(str(config_file))["env"]["MY_VAR"] == "old"
+
+        monkeypatch.undo()
+        assert load_config(str(config_file))["env"]["MY_VAR"] == "updated"
+
+    def test_temp_file_removed_when_write_fails(self, tmp_path, monkeypatch):
+        envlit_dir = tmp_path / ".envlit"
+        envlit_dir.mkdir()
+        config_file = envlit_dir / "default.yaml"
+        config_file.write_text("env:\n  MY_VAR: value\n")
+
+        class FullDisk(io.StringIO):
+            def write(self, s):
+                raise OSError(errno.ENOSPC, "No space left on device")
+
+        def fdopen(fd, mode):
+            os.close(fd)
+            return FullDisk()
+
+        monkeypatch.setattr(config_module.os, "fdopen", fdopen)
+        assert load_config(str(config_file))["env"]["MY_VAR"] == "value"
+
+        assert list((envlit_dir / ".cache").iterdir()) == [envlit_dir / ".cache" / ".gitignore"]
@@ -5,9 +5,21 @@ The envlit-internal-track command is a hidden CLI command used by generated scri
 
 import json
 import os
+import re
 
 from envlit.internal import track_begin, track_end, track_restore
 
+# Matches the single-quoted state export emitted by track_end
+_STATE_RE = re.compile(r"^export (__ENVLIT_STATE_\w+)='([^']*)'$", re.MULTILINE)
+
+
+def _exported_state(result, state_var):
+    """Parse the state JSON exported by track_end output."""
+    match = _STATE_RE.search(result)
+    assert match is not None, result
+    assert match.group(1) == state_var
+    return json.loads(match.group(2))
+
 
 class TestInternalTracking:
     """Test internal state tracking commands."""
@@ -51,8 +63,7 @@ class TestInternalTracking:
         assert f"export {state_var}" in result
 
         # Parse the state
-        state_json = result.split(f"export {state_var}='")[1].split("'")[0]
-        state = json.loads(state_json)
+        state = _exported_state(result, state_var)
 
         # NEW_VAR should be tracked with original=None (unset), current=new_value
         assert "NEW_VAR" in state
@@ -80,8 +91,7 @@ class TestInternalTracking:
         result = track_end()
 
         # Parse updated state
-        state_json = result.split(f"export {state_var}='")[1].split("'")[0]
-        state = json.loads(state_json)
+        state = _exported_state(result, state_var)
 
         # Should keep original="first_value", update current="third_value"
         assert state["MY_VAR"]["original"] == "first_value"
@@ -108,13 +118,63 @@ class TestInternalTracking:
         result = track_end()
 
         # Parse updated state
-        state_json = result.split(f"export {state_var}='")[1].split("'")[0]
-        state = json.loads(state_json)
+        state = _exported_state(result, state_var)
 
         # Manual interference: original should update to "manual_value"
         assert state["MY_VAR"]["original"] == "manual_value"
         assert state["MY_VAR"]["current"] == "third_value"
 
+    def test_track_end_detects_removed_variable(self, monkeypatch):
+        """Test track_end recording a variable that was unset during load."""
+        from envlit.constants import SNAPSHOT_VAR_NAME, get_state_var_name
+
+        state_var = get_state_var_name()
+        monkeypatch.delenv(state_var, raising=False)
+        monkeypatch.delenv("REMOVED_VAR", raising=False)
+
+        # Snapshot A: the variable existed before the load; it is now unset
+        snapshot_a = dict(os.environ, REMOVED_VAR="old_value")
+        monkeypatch.setenv(SNAPSHOT_VAR_NAME, json.dumps(snapshot_a))
+
+        result = track_end()
+
+        state = _exported_state(result, state_var)
+
+        assert state == {"REMOVED_VAR": {"original": "old_value", "current": None}}
+
+    def test_track_end_quotes_single_quotes(self, monkeypatch):
+        """Test track_end output stays shell-safe when a value contains a single quote."""
+        import shlex
+
+        from envlit.constants import SNAPSHOT_VAR_NAME, get_state_var_name
+
+        state_var = get_state_var_name()
+        monkeypatch.delenv(state_var, raising=False)
+        monkeypatch.delenv("QUOTED_VAR", raising=False)
+        monkeypatch.setenv(SNAPSHOT_VAR_NAME, json.dumps(dict(os.environ)))
+        monkeypatch.setenv("QUOTED_VAR", "it's here")
+
+        result = track_end()
+
+        words = shlex.split(result)
+        assert words[0] == "export"
+        name, state_json = words[1].split("=", 1)
+        assert name == state_var
+        assert json.loads(state_json) == {"QUOTED_VAR": {"original": None, "current": "it's here"}}
+
+    def test_track_end_no_changes(self, monkeypatch):
+        """Test track_end leaving the state untouched when nothing changed."""
+        from envlit.constants import SNAPSHOT_VAR_NAME, get_state_var_name
+
+        state_var = get_state_var_name()
+        existing_state = {"MY_VAR": {"original": "first_value", "current": "second_value"}}
+        monkeypatch.setenv(state_var, json.dumps(existing_state))
+        monkeypatch.setenv(SNAPSHOT_VAR_NAME, json.dumps(dict(os.environ)))
+
+        result = track_end()
+
+        assert "export" not in result
+
     def test_track_restore_simple(self, monkeypatch):
         """Test restoring variables to original values."""
         # Setup state with tracked variables
@@ -234,6 +294,28 @@ class TestInternalTracking:
         # (it will remain in the environment)
         assert "USER_VAR" not in result
 
+    def test_track_restore_batches_unsets(self, monkeypatch):
+        """Test that originally-unset variables are cleared with one unset."""
+        from envlit.constants import get_state_var_name
+
+        state_var = get_state_var_name()
+
+        state = {
+            "NEW_A": {"original": None, "current": "a"},
+            "KEPT": {"original": "old", "current": "new"},
+            "NEW_B": {"original": None, "current": "b"},
+        }
+        monkeypatch.setenv(state_var, json.dumps(state))
+        monkeypatch.setenv("NEW_A", "a")
+        monkeypatch.setenv("KEPT", "new")
+        monkeypatch.setenv("NEW_B", "b")
+
+        result = track_restore()
+
+        assert "unset NEW_A NEW_B" in result.splitlines()
+        assert "export KEPT=old" in result
+        assert result.splitlines()[-1] == f"unset {state_var}"
+
     def test_directory_specific_state_var(self, tmp_path):
         """Test that state variable name is directory-specific."""
         from envlit.constants import get_state_var_name
@@ -0,0 +1,63 @@
+"""
+Tests for the JSON helpers used for snapshots and state.
+"""
+
+import json
+
+import pytest
+
+from envlit import _json
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json, "orjson", None)
+    return request.param
+
+
+class TestJsonHelpers:
+    def test_round_trip(self, backend):
+        data = {"PATH": "/usr/bin:/bin", "EMPTY": "", "UNSET": None, "UNICODE": "héllo"}
+        assert _json.loads(_json.dumps(data)) == data
+
+    def test_output_is_standard_json(self, backend):
+        assert json.loads(_json.dumps({"A": {"original": None, "current": "1"}})) == {
+            "A": {"original": None, "current": "1"}
+        }
+
+    def test_output_is_compact(self, backend):
+        assert _json.dumps({"A": {"original": None, "current": "1"}}) == '{"A":{"original":null,"current":"1"}}'
+
+    def test_sort_keys(self, backend):
+        data = {"B": {"original": None, "current": "2"}, "A": {"original": "1", "current": "3"}}
+        result = _json.dumps(data, sort_keys=True)
+        assert list(json.loads(result)) == ["A", "B"]
+        assert result.index('"current"') < result.index('"original"')
+
+    def test_loads_accepts_bytes(self, backend):
+        assert _json.loads(b'{"A": "1"}') == {"A": "1"}
+
+    def test_surrogate_escaped_values_round_trip(self, backend):
+        """Undecodable environment bytes surface as lone surrogates in os.environ."""
+        value = b"caf\xe9".decode("utf-8", "surrogateescape")
+        assert _json.loads(_json.dumps({"VAR": value})) == {"VAR": value}
+
+    def test_invalid_json_raises(self, backend):
+        with pytest.raises(_json.JSONDecodeError):
+            _json.loads("{not json")
+
+    def test_invalid_utf8_bytes_raise_decode_error(self, backend):
+        with pytest.raises(_json.JSONDecodeError):
+            _json.loads(b'{"A": "\xff')
+
+    def test_getenv_round_trip(self, backend, monkeypatch):
+        monkeypatch.setenv("ENVLIT_TEST_PAYLOAD", _json.dumps({"A": "héllo"}))
+        assert _json.loads(_json.getenv("ENVLIT_TEST_PAYLOAD")) == {"A": "héllo"}
+
+    def test_getenv_missing(self, backend, monkeypatch):
+        monkeypatch.delenv("ENVLIT_TEST_PAYLOAD", raising=False)
+        assert _json.getenv("ENVLIT_TEST_PAYLOAD") is None
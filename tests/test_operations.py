@@ -5,6 +5,9 @@ Tests for atomic environment variable operations.
 import pytest
 
 from envlit.operations import (
+    _apply_list_ops_fused,
+    _fused_span_end,
+    _is_fusable,
     apply_operation,
     apply_operations,
     normalize_env_value,
@@ -75,6 +78,22 @@ class TestApplyOperation:
         result = apply_operation("a,b", {"op": "append", "value": "c", "separator": ","})
         assert result == "a,b,c"
 
+    def test_prepend_dedup(self):
+        """Test prepend with dedup moves an existing entry to the front."""
+        operation = {"op": "prepend", "value": "/opt/bin", "dedup": True}
+        result = apply_operation("/usr/bin:/opt/bin:/bin:/opt/bin", operation)
+        assert result == "/opt/bin:/usr/bin:/bin"
+
+    def test_append_dedup(self):
+        """Test append with dedup keeps the first occurrence of each entry."""
+        result = apply_operation("a,b,a", {"op": "append", "value": "b", "separator": ",", "dedup": True})
+        assert result == "a,b"
+
+    def test_prepend_without_dedup_keeps_duplicates(self):
+        """Test duplicates are kept unless dedup is requested."""
+        result = apply_operation("/opt/bin:/bin", {"op": "prepend", "value": "/opt/bin"})
+        assert result == "/opt/bin:/opt/bin:/bin"
+
     def test_remove_from_none(self):
         """Test remove from unset variable."""
         result = apply_operation(None, {"op": "remove", "value": "/some/path"})
@@ -105,6 +124,16 @@ class TestApplyOperation:
         result = apply_operation("/usr/bin:/bin", {"op": "remove", "value": "/not/there"})
         assert result == "/usr/bin:/bin"
 
+    def test_remove_nonexistent_drops_empty_entries(self):
+        """Test removing a missing value still drops empty entries."""
+        result = apply_operation(":/usr/bin::/bin:", {"op": "remove", "value": "/opt"})
+        assert result == "/usr/bin:/bin"
+
+    def test_remove_substring_of_entry_is_noop(self):
+        """Test remove does not touch entries that merely contain the value."""
+        result = apply_operation("/usr/bin:/usr/local/bin", {"op": "remove", "value": "/bin"})
+        assert result == "/usr/bin:/usr/local/bin"
+
     def test_remove_custom_separator(self):
         """Test remove with custom separator."""
         result = apply_operation("a,b,c,b", {"op": "remove", "value": "b", "separator": ","})
@@ -170,6 +199,71 @@ class TestApplyOperations:
         result = apply_operations(initial, operations)
         assert result == "/good:/usr/bin:/local/bin:/bin:/better"
 
+    @pytest.mark.parametrize(
+        "initial, operations",
+        [
+            ("/a:/x::/b:/a", [{"op": "remove", "value": "/a"}, {"op": "remove", "value": "/b"}]),
+            (None, [{"op": "remove", "value": "/a"}, {"op": "prepend", "value": "/b"}]),
+            ("", [{"op": "append", "value": "/a"}, {"op": "prepend", "value": "/b"}]),
+            ("/a", [{"op": "remove", "value": "/a"}, {"op": "append", "value": "/c"}]),
+            ("/a:/b", [{"op": "prepend", "value": "/b", "dedup": True}, {"op": "append", "value": "/a:/d"}]),
+            (
+                "a,b",
+                [{"op": "remove", "value": "a", "separator": ","}, {"op": "append", "value": "c", "separator": ","}],
+            ),
+            ("/a:/b", [{"op": "remove", "value": "/a"}, {"op": "remove", "value": "c", "separator": ","}]),
+            (
+                "a:aa",
+                [
+                    {"op": "set", "value": ""},
+                    {"op": "append", "value": "q"},
+                    {"op": "prepend", "value": "x:", "separator": "::"},
+                    {"op": "append", "value": "/x", "separator": "::"},
+                    {"op": "remove", "value": "q", "separator": "::"},
+                ],
+            ),
+            (
+                ":",
+                [{"op": "prepend", "value": "", "separator": "::"}, {"op": "append", "value": "a", "separator": "::"}],
+            ),
+            (
+                "a:b,c",
+                [
+                    {"op": "append", "value": "d", "separator": ","},
+                    {"op": "remove", "value": "b"},
+                    {"op": "prepend", "value": "x,y", "separator": ","},
+                ],
+            ),
+        ],
+    )
+    def test_fused_list_ops_match_sequential(self, initial, operations):
+        """Test fused prepend/append/remove runs give the same result as applying them one by one."""
+        expected = initial
+        for op in operations:
+            expected = apply_operation(expected, op)
+        assert apply_operations(initial, operations) == expected
+        # apply_operations only fuses when it pays off, so check the fused path directly too
+        if all(_is_fusable(op) for op in operations):
+            assert _apply_list_ops_fused(initial, operations) == expected
+
+    def test_fused_span_covers_repeated_removes(self):
+        """Test fusion spans from a remove to the last remove of its run, and needs two of them."""
+        prepend = {"op": "prepend", "value": "/x"}
+        remove = {"op": "remove", "value": "/a"}
+        other_separator = {"op": "remove", "value": "/a", "separator": "::"}
+        assert _fused_span_end([remove, prepend, remove, prepend], 0) == 3
+        assert _fused_span_end([remove, prepend, prepend], 0) == 1
+        assert _fused_span_end([remove, other_separator], 0) == 1
+        assert _fused_span_end([prepend, remove, remove], 1) == 3
+
+    def test_consecutive_removes_of_everything(self):
+        """Test removing every entry in a batch unsets the variable."""
+        operations = [
+            {"op": "remove", "value": "/a"},
+            {"op": "remove", "value": "/b"},
+        ]
+        assert apply_operations("/a:/b", operations) is None
+
 
 class TestValidateOperation:
     """Test operation validation."""
@@ -214,6 +308,11 @@ class TestValidateOperation:
         with pytest.raises(ValueError, match="Invalid operation 'invalid'"):
             validate_operation({"op": "invalid"})
 
+    def test_unhashable_op_raises_error(self):
+        """Test a non-string op value raises the usual validation error."""
+        with pytest.raises(ValueError, match="Invalid operation"):
+            validate_operation({"op": ["set"]})
+
     def test_set_without_value_raises_error(self):
         """Test set operation without value raises error."""
         with pytest.raises(ValueError, match="Operation 'set' requires 'value' field"):
@@ -239,6 +338,22 @@ class TestValidateOperation:
         with pytest.raises(ValueError, match="Operation 'unset' should not have 'value' field"):
             validate_operation({"op": "unset", "value": "test"})
 
+    def test_valid_dedup_operation(self):
+        """Test dedup is accepted on prepend and append."""
+        validate_operation({"op": "prepend", "value": "/path", "dedup": True})
+        validate_operation({"op": "append", "value": "/path", "dedup": False})
+        # Should not raise
+
+    def test_dedup_on_unsupported_op_raises_error(self):
+        """Test dedup on an operation other than prepend/append raises error."""
+        with pytest.raises(ValueError, match="Operation 'set' does not support 'dedup' field"):
+            validate_operation({"op": "set", "value": "test", "dedup": True})
+
+    def test_non_bool_dedup_raises_error(self):
+        """Test non-boolean dedup raises error."""
+        with pytest.raises(ValueError, match="requires 'dedup' to be true or false"):
+            validate_operation({"op": "prepend", "value": "/path", "dedup": "yes"})
+
 
 class TestNormalizeEnvValue:
     """Test environment value normalization."""
@@ -282,6 +397,19 @@ class TestNormalizeEnvValue:
         result = normalize_env_value("")
         assert result == [{"op": "set", "value": ""}]
 
+    def test_subclasses_are_normalized(self):
+        """Test str/dict/list subclasses take the same paths as the base types."""
+        from collections import OrderedDict
+
+        class PathStr(str):
+            pass
+
+        op = OrderedDict(op="prepend", value="/bin")
+        assert normalize_env_value(PathStr("/x")) == [{"op": "set", "value": "/x"}]
+        assert normalize_env_value(op) == [op]
+        with pytest.raises(ValueError, match="List must contain only operation dictionaries"):
+            normalize_env_value(type("Ops", (list,), {})(["invalid"]))
+
 
 class TestIntegrationScenarios:
     """Test real-world usage scenarios."""
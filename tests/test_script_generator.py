@@ -251,6 +251,11 @@ class TestVariableNameValidation:
         with pytest.raises(ValueError, match="Invalid environment variable name"):
             generate_load_script(config)
 
+    def test_invalid_name_with_trailing_newline(self):
+        config = {"env": {"MY_VAR\n": "value"}, "flags": {}, "hooks": {}}
+        with pytest.raises(ValueError, match="Invalid environment variable name"):
+            generate_load_script(config)
+
     def test_valid_names_accepted(self):
         config = {
             "env": {"_PRIVATE": "a", "MY_VAR": "b", "VAR123": "c"},
@@ -318,6 +323,13 @@ class TestEscapeShellValue:
         result = escape_shell_value("$HOME/projects")
         assert result == "$HOME/projects"
 
+    def test_placeholder_like_text_is_not_rewritten(self):
+        """Test that text resembling an internal placeholder is escaped like any other text."""
+        from envlit.script_generator import escape_shell_value
+
+        result = escape_shell_value("__ENVLIT_VAR_0__ $HOME")
+        assert result == "__ENVLIT_VAR_0__ $HOME"
+
     def test_preserve_variable_with_default(self):
         """Test that ${VAR:-default} syntax is preserved."""
         from envlit.script_generator import escape_shell_value
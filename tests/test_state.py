@@ -95,3 +95,77 @@ class TestStateManagement:
         tracked = manager.get_tracked_variables()
 
         assert set(tracked) == {"VAR1", "VAR2"}
+
+    def test_get_state_round_trips_serialized_format(self, monkeypatch):
+        """Test get_state returns the same nested records that were loaded."""
+        initial_state = {
+            "VAR1": {"original": "a", "current": "b"},
+            "VAR2": {"original": None, "current": "c"},
+        }
+        from envlit.constants import get_state_var_name
+
+        monkeypatch.setenv(get_state_var_name(), json.dumps(initial_state))
+
+        manager = StateManager()
+        assert manager.get_state() == initial_state
+
+        manager.update_variable("VAR3", None, "d")
+        assert manager.get_state()["VAR3"] == {"original": None, "current": "d"}
+
+    def test_get_env_dict(self, monkeypatch):
+        """Test get_env_dict from state and from the environment."""
+        initial_state = {
+            "SET_VAR": {"original": None, "current": "from_state"},
+            "UNSET_VAR": {"original": "old", "current": None},
+            "GONE_VAR": {"original": None, "current": "x"},
+        }
+        from envlit.constants import get_state_var_name
+
+        monkeypatch.setenv(get_state_var_name(), json.dumps(initial_state))
+        monkeypatch.setenv("SET_VAR", "from_env")
+        monkeypatch.delenv("UNSET_VAR", raising=False)
+        monkeypatch.delenv("GONE_VAR", raising=False)
+
+        manager = StateManager()
+
+        assert manager.get_env_dict() == {"SET_VAR": "from_state", "GONE_VAR": "x"}
+        assert manager.get_env_dict(from_env=True) == {"SET_VAR": "from_env"}
+
+    def test_serialize(self, monkeypatch):
+        """Test serialize emits the nested state as compact JSON with sorted keys."""
+        from envlit.constants import get_state_var_name
+
+        monkeypatch.delenv(get_state_var_name(), raising=False)
+
+        manager = StateManager()
+        manager.update_variable("B_VAR", None, "b")
+        manager.update_variable("A_VAR", "old", "a")
+
+        assert manager.serialize() == (
+            '{"A_VAR":{"current":"a","original":"old"},"B_VAR":{"current":"b","original":null}}'
+        )
+
+    def test_serialize_is_reused_until_state_changes(self, monkeypatch):
+        """Test serialize only re-encodes after an update that changes a record."""
+        initial_state = {"VAR1": {"original": "a", "current": "b"}}
+        from envlit.constants import get_state_var_name
+
+        monkeypatch.setenv(get_state_var_name(), json.dumps(initial_state))
+
+        manager = StateManager()
+        first = manager.serialize()
+        assert manager.serialize() is first
+
+        # Consecutive load that sets the same value again
+        manager.update_variable("VAR1", "b", "b")
+        assert manager.serialize() is first
+
+        manager.update_variable("VAR1", "b", "c")
+        assert json.loads(manager.serialize()) == {"VAR1": {"original": "a", "current": "c"}}
+
+    def test_state_var_name_is_stable(self, monkeypatch):
+        """Shells opened by an older envlit must keep finding their state."""
+        from envlit.constants import get_state_var_name
+
+        monkeypatch.setattr(os, "getcwd", lambda: "/home/user/project")
+        assert get_state_var_name() == "__ENVLIT_STATE_90722f26"